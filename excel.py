@@ -32,12 +32,21 @@ class ExcelBook:
         :param bond_list: list of bonds to write in file
         :type bond_list: list[Bond]
         """
+        self.write_rows([bond.as_list for bond in bond_list])
+
+    def write_rows(self, rows: list[list]) -> None:
+        """
+        Writes given rows of bond values (Bond.as_list) to excel file.
+
+        :param rows: rows to write in file
+        :type rows: list[list]
+        """
         wb = openpyxl.Workbook()
         ws = wb.active
 
         ws.append(Bond.headers())
-        for bond in bond_list:
-            ws.append(bond.as_list)
+        for row in rows:
+            ws.append(row)
 
         self._center_worksheet(ws)
         self._auto_width(ws)
@@ -0,0 +1,152 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+import atexit
+import datetime
+import logging
+import logging.handlers
+import multiprocessing
+
+from excel import ExcelBook
+from schemas import Bond
+
+logger = logging.getLogger("Export")
+
+
+EXPORT_PROCESSES = 2
+
+_pool: ProcessPoolExecutor | None = None
+_log_queue: "multiprocessing.Queue | None" = None
+
+
+class _ForwardHandler(logging.Handler):
+    """
+    Passes records received from export processes to loggers of this process.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        logging.getLogger(record.name).handle(record)
+
+
+def _init_process(log_queue: multiprocessing.Queue, level: int) -> None:
+    """
+    Export process initializer. Sends all log records to parent process.
+
+    :param log_queue: Queue read by parent process.
+    :type log_queue: multiprocessing.Queue
+    :param level: Logging level of parent process.
+    :type level: int
+    """
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+def _get_log_queue() -> multiprocessing.Queue:
+    """
+    Returns queue of log records from export processes.
+    Creates it and starts its listener on first call, both are shared by all pools.
+    """
+    global _log_queue
+    if _log_queue is None:
+        _log_queue = multiprocessing.Queue()
+        listener = logging.handlers.QueueListener(_log_queue, _ForwardHandler())
+        listener.start()
+        atexit.register(listener.stop)
+    return _log_queue
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """
+    Returns shared export process pool. Creates it on first call.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=EXPORT_PROCESSES,
+            initializer=_init_process,
+            initargs=(_get_log_queue(), logging.getLogger().getEffectiveLevel()),
+        )
+    return _pool
+
+
+def _reset_pool() -> None:
+    """
+    Shuts down shared export process pool. Next _get_pool call creates new one.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def serialize_bonds(bonds: list[Bond]) -> list[tuple]:
+    """
+    Converts bonds to rows of plain values, cheap to send to another process.
+
+    :param bonds: List of bonds.
+    :type bonds: list[Bond]
+    :return: List of rows with Bond.as_list values.
+    :rtype: list[tuple]
+    """
+    return [tuple(bond.as_list) for bond in bonds]
+
+
+def write_rows(file_name: str, rows: list[tuple]) -> str:
+    """
+    Writes rows to excel file. Runs in export process.
+
+    :param file_name: Desired name for the file.
+    :type file_name: str
+    :param rows: Rows from serialize_bonds.
+    :type rows: list[tuple]
+    :return: Name of the created file.
+    :rtype: str
+    """
+    book = ExcelBook(file_name)
+    book.write_rows(rows)
+    return book.file_name
+
+
+def export_bonds(
+    bonds: list[Bond],
+    group_by: Callable[[Bond], str] | None = None,
+    file_name: str | None = None,
+) -> list[Future]:
+    """
+    Starts writing bonds to excel files in export processes.
+    First file always contains all bonds. If group_by is given and bonds
+    fall into several groups, one more file is written for every group.
+
+    :param bonds: List of bonds to export.
+    :type bonds: list[Bond]
+    :param group_by: Function returning group name of bond. Defaults to None - no groups.
+    :type group_by: Callable[[Bond], str] | None
+    :param file_name: Base name for files. Defaults to the current date.
+    :type file_name: str | None
+    :return: List of futures with names of the created files. First is file with all bonds.
+    :rtype: list[Future]
+    """
+    file_name = file_name or datetime.datetime.now().strftime("%d.%m.%Y")
+    rows = serialize_bonds(bonds)
+
+    batches = {file_name: rows}
+    if group_by is not None:
+        groups = {}
+        for bond, row in zip(bonds, rows):
+            groups.setdefault(f"{file_name} {group_by(bond)}", []).append(row)
+        # Single group file would repeat the file with all bonds.
+        if len(groups) > 1:
+            batches.update(groups)
+
+    logger.info("Запуск экспорта %d файлов.", len(batches))
+    try:
+        pool = _get_pool()
+        return [pool.submit(write_rows, name, batch) for name, batch in batches.items()]
+    except BrokenProcessPool:
+        # Crashed export process breaks the pool for good, start new one.
+        logger.warning("Пул процессов экспорта поврежден, создаю новый.")
+        _reset_pool()
+        pool = _get_pool()
+        return [pool.submit(write_rows, name, batch) for name, batch in batches.items()]
@@ -0,0 +1,104 @@
+import atexit
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+FORMAT = "%(asctime)s - %(name)s:%(levelname)s - %(message)s"
+DATE_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats log records as one-line JSON objects.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record, self.datefmt),
+            "name": record.name,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler which keeps traceback separate from message.
+    Default QueueHandler merges traceback into message, so JsonFormatter can't write it as a field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def setup_logging(
+    level: int | str | None = None,
+    json_output: bool | None = None,
+    file_name: str | None = None,
+) -> logging.handlers.QueueListener:
+    """
+    Sets up logging through queue: loggers only put records to queue,
+    file and console handlers are run by QueueListener in separate thread.
+
+    :param level: Logging level. Defaults to MOEX_LOG_LEVEL environment variable or INFO.
+    :type level: int | str | None
+    :param json_output: Write logs as JSON lines. Defaults to MOEX_LOG_JSON environment variable.
+    :type json_output: bool | None
+    :param file_name: Log file name. Defaults to the current date.
+    :type file_name: str | None
+    :return: Started QueueListener. It's stopped automatically at exit.
+    :rtype: logging.handlers.QueueListener
+    """
+    if level is None:
+        level = os.environ.get("MOEX_LOG_LEVEL", "INFO").upper()
+    unknown_level = isinstance(level, str) and not isinstance(
+        logging.getLevelName(level), int
+    )
+    if unknown_level:
+        bad_level, level = level, logging.INFO
+    if json_output is None:
+        json_output = os.environ.get("MOEX_LOG_JSON", "") not in ("", "0")
+    file_name = file_name or f"{datetime.datetime.now().strftime('%d.%m.%Y')}.log"
+
+    if json_output:
+        formatter = JsonFormatter(datefmt=DATE_FORMAT)
+    else:
+        formatter = logging.Formatter(FORMAT, datefmt=DATE_FORMAT)
+
+    handlers = [
+        logging.FileHandler(file_name, mode="w", encoding="utf-8"),
+        logging.StreamHandler(),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers.clear()
+    root.addHandler(_QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    if unknown_level:
+        logging.getLogger("Log").warning(
+            "Неизвестный уровень логирования %s, используется INFO.", bad_level
+        )
+    return listener
@@ -1,45 +1,54 @@
 ﻿import os
 import sys
 from subprocess import Popen
-import datetime
+import importlib
 import logging
+import multiprocessing
+import threading
 
-from PySide6.QtCore import QCoreApplication, Qt, QThreadPool
+from PySide6.QtCore import QCoreApplication, Qt, QThreadPool, QTimer
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
+    QCheckBox,
+    QComboBox,
     QDoubleSpinBox,
+    QGroupBox,
+    QHeaderView,
     QLabel,
+    QLineEdit,
     QProgressBar,
     QPushButton,
     QSpinBox,
+    QTableView,
+    QTabWidget,
     QWidget,
     QMainWindow,
+    QMessageBox,
     QGridLayout,
     QApplication,
     QWidget,
 )
 
-from schemas import SearchCriteria
-from worker import Worker
-
-
-# Setting up logging.
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s:%(levelname)s - %(message)s",
-    datefmt="%d.%m.%Y %H:%M:%S",
-    handlers=[
-        logging.FileHandler(
-            f"{datetime.datetime.now().strftime("%d.%m.%Y")}.log",
-            mode="w",
-            encoding="utf-8",
-        ),
-        logging.StreamHandler(),
-    ],
-)
+from log import setup_logging
+from schemas import Bond, SearchCriteria
+from table import BondFilterProxyModel, BondTableModel, PortfolioTableModel
+
 
 logger = logging.getLogger("Main")
 
+# Heavy modules (requests, bs4, openpyxl, numpy) are imported by worker and portfolio.
+# It's loaded in background after the window is shown, see preload_worker.
+
+
+def preload_worker() -> None:
+    """
+    Starts importing worker module in background thread.
+    """
+    threading.Thread(
+        target=importlib.import_module, args=("worker",), daemon=True
+    ).start()
+
 
 class MainWindow(QMainWindow):
     """
@@ -79,6 +88,52 @@ class MainWindow(QMainWindow):
         self.maxDaysToMaturitySpinBox.setMinimum(0)
         self.maxDaysToMaturitySpinBox.setMaximum(10**6)
 
+        # Количество лучших облигаций
+        self.topNLabel = QLabel()
+        self.topNSpinBox = QSpinBox()
+        self.topNSpinBox.setMinimum(0)
+        self.topNSpinBox.setMaximum(10**6)
+        self.topNSpinBox.setValue(300)
+
+        # Портфель
+        self.portfolioGroupBox = QGroupBox()
+        self.portfolioGroupBox.setCheckable(True)
+        self.portfolioGroupBox.setChecked(False)
+        portfolioLayout = QGridLayout()
+        self.portfolioGroupBox.setLayout(portfolioLayout)
+        # Бюджет
+        self.budgetLabel = QLabel()
+        self.budgetDoubleSpinBox = QDoubleSpinBox()
+        self.budgetDoubleSpinBox.setMinimum(0)
+        self.budgetDoubleSpinBox.setMaximum(10**12)
+        self.budgetDoubleSpinBox.setValue(100_000)
+        # Лестница погашений
+        self.ladderYearsLabel = QLabel()
+        self.ladderYearsSpinBox = QSpinBox()
+        self.ladderYearsSpinBox.setMinimum(0)
+        self.ladderYearsSpinBox.setMaximum(50)
+        # Минимальный рейтинг
+        self.minRatingLabel = QLabel()
+        self.minRatingComboBox = QComboBox()
+        self.minRatingComboBox.addItem("", None)
+        for rating in ["AAA", "AA", "A", "BBB", "BB", "B"]:
+            self.minRatingComboBox.addItem(rating, rating)
+        # Доля одного эмитента
+        self.issuerCapLabel = QLabel()
+        self.issuerCapDoubleSpinBox = QDoubleSpinBox()
+        self.issuerCapDoubleSpinBox.setMinimum(0.01)
+        self.issuerCapDoubleSpinBox.setMaximum(100)
+        self.issuerCapDoubleSpinBox.setValue(10)
+
+        portfolioLayout.addWidget(self.budgetLabel, 0, 0)
+        portfolioLayout.addWidget(self.budgetDoubleSpinBox, 0, 1)
+        portfolioLayout.addWidget(self.ladderYearsLabel, 1, 0)
+        portfolioLayout.addWidget(self.ladderYearsSpinBox, 1, 1)
+        portfolioLayout.addWidget(self.minRatingLabel, 2, 0)
+        portfolioLayout.addWidget(self.minRatingComboBox, 2, 1)
+        portfolioLayout.addWidget(self.issuerCapLabel, 3, 0)
+        portfolioLayout.addWidget(self.issuerCapDoubleSpinBox, 3, 1)
+
         # Кнопка "Старт"
         self.startWorkButton = QPushButton()
         self.startWorkButton.clicked.connect(self.startWork)
@@ -91,6 +146,41 @@ class MainWindow(QMainWindow):
         # Прогресс бар
         self.progressBar = QProgressBar()
         self.progressBar.setValue(0)
+        # Сохранять в Excel
+        self.exportExcelCheckBox = QCheckBox()
+        self.exportExcelCheckBox.setChecked(True)
+        # Отдельный файл для каждой валюты
+        self.splitByCurrencyCheckBox = QCheckBox()
+        self.exportExcelCheckBox.toggled.connect(self.splitByCurrencyCheckBox.setEnabled)
+
+        # Фильтр таблицы
+        self.filterLineEdit = QLineEdit()
+        # Таблица результатов
+        self.bondModel = BondTableModel(self)
+        self.bondProxyModel = BondFilterProxyModel(self)
+        self.bondProxyModel.setSourceModel(self.bondModel)
+        self.filterLineEdit.textChanged.connect(self.bondProxyModel.set_pattern)
+        self.resultsTableView = QTableView()
+        self.resultsTableView.setModel(self.bondProxyModel)
+        self.resultsTableView.setSortingEnabled(True)
+        self.resultsTableView.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        # Fixed row height: the view doesn't measure rows it doesn't paint.
+        self.resultsTableView.verticalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Fixed
+        )
+        self.resultsTableView.horizontalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Interactive
+        )
+        # Таблица портфеля
+        self.portfolioModel = PortfolioTableModel(self)
+        self.portfolioTableView = QTableView()
+        self.portfolioTableView.setModel(self.portfolioModel)
+        # Вкладки
+        self.resultsTabWidget = QTabWidget()
+        self.resultsTabWidget.addTab(self.resultsTableView, "")
+        self.resultsTabWidget.addTab(self.portfolioTableView, "")
 
         self.centralLayout.addWidget(self.minBondYieldLabel, 0, 0)
         self.centralLayout.addWidget(self.minBondYieldDoubleSpinBox, 0, 1)
@@ -99,14 +189,21 @@ class MainWindow(QMainWindow):
         self.centralLayout.addWidget(self.maxDaysToMaturityLabel, 2, 1)
         self.centralLayout.addWidget(self.minDaysToMaturitySpinBox, 3, 0)
         self.centralLayout.addWidget(self.maxDaysToMaturitySpinBox, 3, 1)
-        self.centralLayout.addWidget(self.startWorkButton, 4, 0, 1, 2)
-        self.centralLayout.addWidget(self.showFileButton, 5, 0)
-        self.centralLayout.addWidget(self.openFileButton, 5, 1)
-        self.centralLayout.addWidget(self.progressBar, 6, 0, 1, 2)
+        self.centralLayout.addWidget(self.topNLabel, 4, 0)
+        self.centralLayout.addWidget(self.topNSpinBox, 4, 1)
+        self.centralLayout.addWidget(self.portfolioGroupBox, 5, 0, 1, 2)
+        self.centralLayout.addWidget(self.startWorkButton, 6, 0, 1, 2)
+        self.centralLayout.addWidget(self.showFileButton, 7, 0)
+        self.centralLayout.addWidget(self.openFileButton, 7, 1)
+        self.centralLayout.addWidget(self.progressBar, 8, 0, 1, 2)
+        self.centralLayout.addWidget(self.exportExcelCheckBox, 9, 0)
+        self.centralLayout.addWidget(self.splitByCurrencyCheckBox, 9, 1)
+        self.centralLayout.addWidget(self.filterLineEdit, 10, 0, 1, 2)
+        self.centralLayout.addWidget(self.resultsTabWidget, 11, 0, 1, 2)
+        self.centralLayout.setRowStretch(11, 1)
 
         self.retranslateUi()
-        self.adjustSize()
-        self.setFixedSize(self.sizeHint())
+        self.resize(900, 700)
 
     def startWork(self):
         """
@@ -117,12 +214,26 @@ class MainWindow(QMainWindow):
         self.showFileButton.setEnabled(False)
         self.openFileButton.setEnabled(False)
 
+        self.bondModel.clear()
+        self.portfolioModel.set_positions([])
+
+        # Waits for preload_worker if import is still running.
+        from worker import Worker
+
         search_criteria = self.get_search_criteria()
-        worker = Worker(search_criteria)
+        worker = Worker(
+            search_criteria,
+            self.exportExcelCheckBox.isChecked(),
+            self.splitByCurrencyCheckBox.isChecked(),
+            self.get_portfolio_constraints(),
+        )
 
         worker.signals.progress.connect(self.progressBar.setValue)
+        worker.signals.result.connect(self.bondModel.add_bonds)
+        worker.signals.portfolio.connect(self.portfolioModel.set_positions)
 
         worker.signals.finished.connect(self.on_file_ready)
+        worker.signals.error.connect(self.on_error)
 
         self.threadpool.start(worker)
 
@@ -133,36 +244,87 @@ class MainWindow(QMainWindow):
         :return: SearchCriteria object.
         :rtype: SearchCriteria
         """
-        min_yield = self.minBondYieldDoubleSpinBox.value() / 0.87
+        min_yield = self.minBondYieldDoubleSpinBox.value() / (1 - Bond.TAX_RATE)
         min_days = self.minDaysToMaturitySpinBox.value()
         max_days = self.maxDaysToMaturitySpinBox.value() or float("inf")
+        top_n = self.topNSpinBox.value() or None
 
         return SearchCriteria(
             min_bond_yield=min_yield,
             min_days_to_maturity=min_days,
             max_days_to_maturity=max_days,
             face_units=None,
+            top_n=top_n,
+        )
+
+    def get_portfolio_constraints(self):
+        """
+        Creates portfolio constraints from user input.
+        Ladder of N years splits budget equally between N one-year buckets.
+
+        :return: PortfolioConstraints object. None if portfolio is not requested.
+        :rtype: PortfolioConstraints | None
+        """
+        if not self.portfolioGroupBox.isChecked():
+            return None
+
+        # Imported here: portfolio loads numpy.
+        from portfolio import LadderBucket, PortfolioConstraints
+
+        years = self.ladderYearsSpinBox.value()
+        if years:
+            ladder = [
+                LadderBucket(year * 365, (year + 1) * 365 - 1, 1 / years)
+                for year in range(years)
+            ]
+        else:
+            ladder = [LadderBucket()]
+
+        return PortfolioConstraints(
+            budget=self.budgetDoubleSpinBox.value(),
+            ladder=ladder,
+            min_rating=self.minRatingComboBox.currentData(),
+            issuer_cap=self.issuerCapDoubleSpinBox.value() / 100,
         )
 
     def on_file_ready(self, file_name: str):
         """
         Handler for worker finished.
-        Turns startWorkButton, showFileButton, openFileButton on.
+        Turns startWorkButton on.
+        If file was created turns showFileButton, openFileButton on.
         Binds showFileButton.clicked to open explorer on excel file.
         Binds openFileButton.clicked to open excel file.
 
-        :param file_name: name of file to highlight in explorer.
+        :param file_name: name of file to highlight in explorer. Empty if export is disabled.
         :type file_name: str
         """
+        self.startWorkButton.setEnabled(True)
+        if not file_name:
+            return
+
         cmd = f"explorer /select,{file_name}"
 
         self.showFileButton.clicked.connect(lambda: Popen(cmd))
         self.openFileButton.clicked.connect(lambda: os.startfile(file_name))
 
-        self.startWorkButton.setEnabled(True)
         self.showFileButton.setEnabled(True)
         self.openFileButton.setEnabled(True)
 
+    def on_error(self, message: str):
+        """
+        Handler for worker error.
+        Turns startWorkButton on and shows error message.
+
+        :param message: Error message.
+        :type message: str
+        """
+        self.startWorkButton.setEnabled(True)
+        QMessageBox.warning(
+            self,
+            QCoreApplication.translate("MainWindow", "Ошибка"),
+            message,
+        )
+
     def retranslateUi(self):
         self.setWindowTitle(
             QCoreApplication.translate("MainWindow", "MOEX Bonds Analyzer by n1tr0xs")
@@ -179,6 +341,9 @@ class MainWindow(QMainWindow):
         self.maxDaysToMaturityLabel.setText(
             QCoreApplication.translate("MainWindow", "Максимум")
         )
+        self.topNLabel.setText(
+            QCoreApplication.translate("MainWindow", "Лучших облигаций (0 - все)")
+        )
         self.startWorkButton.setText(QCoreApplication.translate("MainWindow", "Старт"))
         self.showFileButton.setText(
             QCoreApplication.translate("MainWindow", "Показать файл отчета")
@@ -186,10 +351,48 @@ class MainWindow(QMainWindow):
         self.openFileButton.setText(
             QCoreApplication.translate("MainWindow", "Открыть файл отчета")
         )
+        self.exportExcelCheckBox.setText(
+            QCoreApplication.translate("MainWindow", "Сохранять отчет в Excel")
+        )
+        self.portfolioGroupBox.setTitle(
+            QCoreApplication.translate("MainWindow", "Подобрать портфель")
+        )
+        self.budgetLabel.setText(QCoreApplication.translate("MainWindow", "Бюджет, руб."))
+        self.ladderYearsLabel.setText(
+            QCoreApplication.translate("MainWindow", "Лестница погашений, лет (0 - нет)")
+        )
+        self.minRatingLabel.setText(
+            QCoreApplication.translate("MainWindow", "Минимальный рейтинг")
+        )
+        self.minRatingComboBox.setItemText(
+            0, QCoreApplication.translate("MainWindow", "Любой")
+        )
+        self.issuerCapLabel.setText(
+            QCoreApplication.translate("MainWindow", "Максимум на эмитента, %")
+        )
+        self.resultsTabWidget.setTabText(
+            0, QCoreApplication.translate("MainWindow", "Облигации")
+        )
+        self.resultsTabWidget.setTabText(
+            1, QCoreApplication.translate("MainWindow", "Портфель")
+        )
+        self.splitByCurrencyCheckBox.setText(
+            QCoreApplication.translate("MainWindow", "Отдельный файл для каждой валюты")
+        )
+        self.filterLineEdit.setPlaceholderText(
+            QCoreApplication.translate(
+                "MainWindow", "Фильтр: наименование, ISIN, рейтинг, валюта"
+            )
+        )
 
 
 if __name__ == "__main__":
+    # Frozen (PyInstaller) export processes must exit here instead of starting GUI.
+    multiprocessing.freeze_support()
+    # Not at import time: export processes import this module on spawn.
+    setup_logging()
     app = QApplication([])
     window = MainWindow()
     window.show()
+    QTimer.singleShot(0, preload_worker)
     sys.exit(app.exec())
@@ -9,6 +9,7 @@ logger = logging.getLogger("MOEX")
 class MOEX_API:
     API_DELAY = round(60 / 50, 1)
     BOARDGROUPS = [7, 58, 105]
+    LOG_PROGRESS_EVERY = 500
 
     def __init__(self):
         """
@@ -35,19 +36,23 @@ class MOEX_API:
         :return: List of bonds found in specified boardgroup.
         :rtype: list[Bond]
         """
-        logger.info(f"Запрос данных для группы {boardgroup}.")
+        logger.info("Запрос данных для группы %s.", boardgroup)
         bonds = []
         securities = self.fetch_boardgroup_securities(boardgroup)
-        logger.info(f"В группе {boardgroup} обнаружено {len(securities)} бумаг.")
+        total = len(securities)
+        logger.info("В группе %s обнаружено %d бумаг.", boardgroup, total)
         for i, ISIN in enumerate(securities, start=1):
-            logger.info(f"Обработка {i}/{len(securities)} - {ISIN}.")
+            if i % self.LOG_PROGRESS_EVERY == 0:
+                logger.info("Обработано %d/%d бумаг группы %s.", i, total, boardgroup)
 
             bond_data = securities[ISIN]
             try:
                 bonds.append(Bond.from_list(bond_data))
             except Exception as e:
                 logger.warning(
-                    f"Ошибка при получении информации по {ISIN}. Информация по облигации: {bond_data}."
+                    "Ошибка при получении информации по %s. Информация по облигации: %s.",
+                    ISIN,
+                    bond_data,
                 )
                 logger.exception(e)
 
@@ -68,7 +73,7 @@ class MOEX_API:
             "iss.dp": "comma",
             "iss.meta": "off",
             "iss.only": "securities",
-            "securities.columns": "SECID,SHORTNAME,FACEVALUE,COUPONVALUE,COUPONPERIOD,MATDATE,PREVLEGALCLOSEPRICE,ACCRUEDINT,FACEUNIT",
+            "securities.columns": "SECID,SHORTNAME,FACEVALUE,COUPONVALUE,COUPONPERIOD,MATDATE,PREVLEGALCLOSEPRICE,ACCRUEDINT,FACEUNIT,LOTSIZE,REGNUMBER",
         }
         json = self._get_json(url, params=params)
         securities = json.get("securities", {}).get("data", {})
@@ -100,7 +105,7 @@ class MOEX_API:
             delta = (now - self.last_api_request).total_seconds()
             wait_time = self.API_DELAY - delta
             if wait_time > 0:
-                logger.info(f"Ожидание {wait_time:.2f} секунд...")
+                logger.info("Ожидание %.2f секунд...", wait_time)
                 time.sleep(self.API_DELAY - delta)
 
         self.last_api_request = datetime.datetime.now()
@@ -121,7 +126,7 @@ class MOEX_API:
         r = requests.Request("GET", url, params=params)
         prepared = self.session.prepare_request(r)
 
-        logger.info(f"Запрос к {prepared.url}.")
+        logger.info("Запрос к %s.", prepared.url)
 
         try:
             response = self.session.send(prepared)
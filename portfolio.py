@@ -0,0 +1,308 @@
+from dataclasses import dataclass, field
+import logging
+import math
+
+import numpy as np
+
+from ranking import rank_bonds, rating_bucket
+from schemas import Bond
+
+logger = logging.getLogger("Portfolio")
+
+# Minimum cost of knapsack item in budget units. Lower values give larger rounding error.
+PACK_UNITS = 20
+# Candidates keys for ranking.rank_bonds: portfolio income depends on annual yield.
+CANDIDATE_KEYS = (
+    ("approximate_yield", True),
+    ("days_to_maturity", False),
+)
+
+
+@dataclass
+class LadderBucket:
+    """
+    Maturity ladder bucket dataclass.
+
+    Args:
+        min_days_to_maturity (float): Minimum days to bond maturity.
+        max_days_to_maturity (float): Maximum days to bond maturity.
+        share (float): Share of budget for the bucket.
+    """
+
+    min_days_to_maturity: float = 0
+    max_days_to_maturity: float = float("inf")
+    share: float = 1
+
+
+@dataclass
+class PortfolioConstraints:
+    """
+    Portfolio constraints dataclass.
+
+    Args:
+        budget (float): Money available for the portfolio.
+        ladder (list[LadderBucket]): Maturity ladder. Defaults to one bucket for all maturities.
+        min_rating (str): Worst allowed credit score, e.g. "A". Defaults to None - any rating, including unknown.
+        issuer_cap (float): Maximum share of budget for one issuer. Defaults to 1.
+        face_unit (str): Currency of budget, bonds with other face units are skipped. Defaults to "SUR".
+        resolution (int): Amount of budget units per ladder bucket used by optimizer. Higher is more precise and slower. Defaults to 2000.
+    """
+
+    budget: float
+    ladder: list[LadderBucket] = field(default_factory=lambda: [LadderBucket()])
+    min_rating: str | None = None
+    issuer_cap: float = 1
+    face_unit: str = "SUR"
+    resolution: int = 2000
+
+
+@dataclass
+class Position:
+    """
+    Portfolio position dataclass.
+
+    Args:
+        bond (Bond): Bond to buy.
+        lots (int): Amount of lots to buy.
+    """
+
+    bond: Bond
+    lots: int
+
+    @property
+    def cost(self) -> float:
+        return self.lots * self.bond.lot_size * self.bond.broker_price
+
+    @property
+    def annual_income(self) -> float:
+        return self.cost * self.bond.approximate_yield / 100
+
+
+def select_candidates(
+    bonds: list[Bond], constraints: PortfolioConstraints, n: int | None = None
+) -> list[Bond]:
+    """
+    Selects n best bonds by annual yield within every ladder bucket.
+    Top by total yield to maturity favors long bonds and may leave short buckets empty.
+
+    :param bonds: List of bonds to choose from.
+    :type bonds: list[Bond]
+    :param constraints: Portfolio constraints.
+    :type constraints: PortfolioConstraints
+    :param n: Amount of bonds per bucket. Defaults to None - all bonds of bucket.
+    :type n: int | None
+    :return: List of candidates without duplicates.
+    :rtype: list[Bond]
+    """
+    bonds = [b for b in bonds if b.face_unit == constraints.face_unit]
+    candidates = {}
+    for bucket in constraints.ladder:
+        bucket_bonds = [
+            b
+            for b in bonds
+            if bucket.min_days_to_maturity
+            <= b.days_to_maturity
+            <= bucket.max_days_to_maturity
+        ]
+        for bond in rank_bonds(bucket_bonds, n, CANDIDATE_KEYS):
+            candidates.setdefault(bond.ISIN, bond)
+    return list(candidates.values())
+
+
+def build_portfolio(
+    bonds: list[Bond], constraints: PortfolioConstraints
+) -> list[Position]:
+    """
+    Selects lot quantities maximizing annual income of the portfolio.
+
+    Every ladder bucket gets its share of budget and is solved as group knapsack
+    over budget units: issuers are groups, bonds of issuer are bounded items.
+    Cheap lots are packed so that one item costs at least PACK_UNITS units,
+    which keeps rounding of costs to units small for any budget.
+    Money left after knapsack (rounding, partial packs) is spent greedily
+    on single lots of the most profitable bonds.
+    Buckets are solved in order, issuer cap spent in a bucket is not available in next ones.
+
+    :param bonds: List of bonds to choose from.
+    :type bonds: list[Bond]
+    :param constraints: Portfolio constraints.
+    :type constraints: PortfolioConstraints
+    :return: List of positions.
+    :rtype: list[Position]
+    """
+    max_bucket = (
+        rating_bucket(constraints.min_rating)
+        if constraints.min_rating
+        else float("inf")
+    )
+
+    candidates = []
+    for bond in bonds:
+        # Budget is in one currency, prices in other currencies are not comparable.
+        if bond.face_unit != constraints.face_unit:
+            continue
+        lot_cost = bond.lot_size * bond.broker_price
+        if not math.isfinite(lot_cost) or lot_cost <= 0:
+            continue
+        if bond.approximate_yield <= 0:
+            continue
+        if rating_bucket(bond.credit_score) > max_bucket:
+            continue
+        candidates.append(bond)
+
+    days = np.array([b.days_to_maturity for b in candidates], dtype=float)
+    lot_costs = np.array(
+        [b.lot_size * b.broker_price for b in candidates], dtype=float
+    )
+    yields = np.array([b.approximate_yield for b in candidates], dtype=float)
+    values = lot_costs * yields / 100
+    issuers = [b.issuer for b in candidates]
+
+    issuer_cap = constraints.budget * constraints.issuer_cap
+    issuer_left = {issuer: issuer_cap for issuer in issuers}
+    lots = np.zeros(len(candidates), dtype=int)
+    for bucket in constraints.ladder:
+        bucket_budget = constraints.budget * bucket.share
+        mask = (bucket.min_days_to_maturity <= days) & (
+            days <= bucket.max_days_to_maturity
+        )
+        indices = np.flatnonzero(mask)
+        if bucket_budget <= 0 or not len(indices):
+            continue
+
+        unit = bucket_budget / constraints.resolution
+        pack_lots = np.maximum(1, np.floor(PACK_UNITS * unit / lot_costs)).astype(int)
+        pack_units = np.ceil(pack_lots * lot_costs / unit).astype(int)
+        pack_values = pack_lots * values
+
+        groups = {}
+        for i in indices:
+            groups.setdefault(issuers[i], []).append(i)
+        caps = {
+            issuer: min(constraints.resolution, int(issuer_left[issuer] // unit))
+            for issuer in groups
+        }
+        packs = _solve_bucket(
+            groups, caps, pack_units, pack_values, constraints.resolution
+        )
+
+        spent = 0
+        for i, amount in packs.items():
+            lots[i] += amount * pack_lots[i]
+            cost = amount * pack_lots[i] * lot_costs[i]
+            issuer_left[issuers[i]] -= cost
+            spent += cost
+
+        # Greedy fill of money left after knapsack.
+        left = bucket_budget - spent
+        for i in indices[np.argsort(-yields[indices], kind="stable")]:
+            amount = int(min(left, issuer_left[issuers[i]]) // lot_costs[i])
+            if amount <= 0:
+                continue
+            lots[i] += amount
+            cost = amount * lot_costs[i]
+            issuer_left[issuers[i]] -= cost
+            left -= cost
+
+    positions = [
+        Position(candidates[i], int(lots[i])) for i in np.flatnonzero(lots)
+    ]
+    logger.info(
+        "Портфель: %d позиций, стоимость %.2f, годовой доход %.2f.",
+        len(positions),
+        sum(p.cost for p in positions),
+        sum(p.annual_income for p in positions),
+    )
+    return positions
+
+
+def _solve_bucket(
+    groups: dict[str, list[int]],
+    caps: dict[str, int],
+    cost_units: np.ndarray,
+    values: np.ndarray,
+    budget_units: int,
+) -> dict[int, int]:
+    """
+    Solves group knapsack for one ladder bucket.
+
+    :param groups: Dictionary {issuer: indices of issuer bonds}.
+    :type groups: dict[str, list[int]]
+    :param caps: Dictionary {issuer: maximum budget units for issuer}.
+    :type caps: dict[str, int]
+    :param cost_units: Item costs in budget units.
+    :type cost_units: np.ndarray
+    :param values: Item annual incomes.
+    :type values: np.ndarray
+    :param budget_units: Bucket budget in budget units.
+    :type budget_units: int
+    :return: Dictionary {bond index: items}.
+    :rtype: dict[int, int]
+    """
+    # dp[b] - best value with spend not more than b units.
+    dp = np.zeros(budget_units + 1)
+    choices = []
+    for issuer, indices in groups.items():
+        cap = caps[issuer]
+        if cap <= 0:
+            continue
+        best, pieces = _solve_issuer(indices, cap, cost_units, values)
+
+        new_dp = dp.copy()
+        choice = np.zeros(budget_units + 1, dtype=np.int32)
+        # Spend k is useful only if it gives more than spend k - 1.
+        for k in np.flatnonzero(np.diff(best) > 0) + 1:
+            candidate = dp[: budget_units + 1 - k] + best[k]
+            better = candidate > new_dp[k:]
+            new_dp[k:][better] = candidate[better]
+            choice[k:][better] = k
+        dp = new_dp
+        choices.append((choice, pieces))
+
+    result = {}
+    b = budget_units
+    for choice, pieces in reversed(choices):
+        k = int(choice[b])
+        b -= k
+        for i, amount, take in reversed(pieces):
+            if take[k]:
+                result[i] = result.get(i, 0) + amount
+                k -= amount * cost_units[i]
+    return result
+
+
+def _solve_issuer(
+    indices: list[int], cap: int, cost_units: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, list[tuple[int, int, np.ndarray]]]:
+    """
+    Solves bounded knapsack for bonds of one issuer.
+    Items of every bond are split into pieces of 1, 2, 4, ... items.
+
+    :param indices: Indices of issuer bonds.
+    :type indices: list[int]
+    :param cap: Maximum budget units for issuer.
+    :type cap: int
+    :param cost_units: Item costs in budget units.
+    :type cost_units: np.ndarray
+    :param values: Item annual incomes.
+    :type values: np.ndarray
+    :return: Best values for every spend up to cap and list of pieces (bond index, items, take mask).
+    :rtype: tuple[np.ndarray, list[tuple[int, int, np.ndarray]]]
+    """
+    best = np.zeros(cap + 1)
+    pieces = []
+    for i in indices:
+        cost = cost_units[i]
+        max_items = cap // cost if cost > 0 else 0
+        amount = 1
+        while max_items > 0:
+            amount = min(amount, max_items)
+            piece_cost = amount * cost
+            candidate = best[: cap + 1 - piece_cost] + amount * values[i]
+            take = np.zeros(cap + 1, dtype=bool)
+            take[piece_cost:] = candidate > best[piece_cost:]
+            best[piece_cost:][take[piece_cost:]] = candidate[take[piece_cost:]]
+            pieces.append((i, amount, take))
+            max_items -= amount
+            amount *= 2
+    return best, pieces
@@ -0,0 +1,94 @@
+import heapq
+import logging
+import re
+
+from schemas import Bond
+
+logger = logging.getLogger("Ranking")
+
+
+RATING_BUCKETS = {
+    "AAA": 0,
+    "AA": 1,
+    "A": 2,
+    "BBB": 3,
+    "BB": 4,
+    "B": 5,
+    "CCC": 6,
+    "CC": 6,
+    "C": 6,
+    "D": 7,
+}
+UNKNOWN_RATING_BUCKET = max(RATING_BUCKETS.values()) + 1
+
+KEY_GETTERS = {
+    "yield_to_maturity": lambda bond: bond.yield_to_maturity,
+    "approximate_yield": lambda bond: bond.approximate_yield,
+    "days_to_maturity": lambda bond: bond.days_to_maturity,
+    "rating": lambda bond: rating_bucket(bond.credit_score),
+}
+
+# Pairs of (key name, descending).
+DEFAULT_KEYS = (
+    ("yield_to_maturity", True),
+    ("rating", False),
+    ("days_to_maturity", False),
+)
+# Credit scores are not known before enrichment.
+PRESCORE_KEYS = (
+    ("yield_to_maturity", True),
+    ("days_to_maturity", False),
+)
+
+
+def rating_bucket(credit_score: str | None) -> int:
+    """
+    Converts credit score to rating bucket. Lower bucket means better rating.
+    Notches (+/-) and agency suffixes are ignored: "ruAA-", "AA(RU)", "AA+|ru|" are all "AA".
+
+    :param credit_score: Credit score of bond issuer.
+    :type credit_score: str | None
+    :return: Rating bucket. UNKNOWN_RATING_BUCKET if score is unknown.
+    :rtype: int
+    """
+    if not credit_score:
+        return UNKNOWN_RATING_BUCKET
+    match = re.search(r"[ABCD]+", credit_score.upper())
+    if not match:
+        return UNKNOWN_RATING_BUCKET
+    return RATING_BUCKETS.get(match.group(), UNKNOWN_RATING_BUCKET)
+
+
+def rank_bonds(
+    bonds: list[Bond],
+    n: int | None = None,
+    keys: tuple[tuple[str, bool], ...] = DEFAULT_KEYS,
+) -> list[Bond]:
+    """
+    Returns n best bonds ordered by specified keys.
+    Key values are computed once per bond, then top n are selected with heap.
+
+    :param bonds: List of bonds to rank.
+    :type bonds: list[Bond]
+    :param n: Amount of bonds to return. None - return all bonds.
+    :type n: int | None
+    :param keys: Pairs of (key name from KEY_GETTERS, descending). Defaults to DEFAULT_KEYS.
+    :type keys: tuple[tuple[str, bool], ...]
+    :return: List of best bonds sorted by keys.
+    :rtype: list[Bond]
+    """
+    columns = []
+    for name, descending in keys:
+        getter = KEY_GETTERS[name]
+        sign = -1 if descending else 1
+        columns.append([sign * getter(bond) for bond in bonds])
+    sort_keys = list(zip(*columns)) if columns else [()] * len(bonds)
+
+    indices = range(len(bonds))
+    if n is None or n >= len(bonds):
+        order = sorted(indices, key=sort_keys.__getitem__)
+    else:
+        order = heapq.nsmallest(n, indices, key=sort_keys.__getitem__)
+
+    logger.info("Отобрано %d из %d облигаций.", len(order), len(bonds))
+    return [bonds[i] for i in order]
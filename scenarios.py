@@ -0,0 +1,236 @@
+from dataclasses import dataclass, field
+import argparse
+import datetime
+import itertools
+import logging
+
+import numpy as np
+
+from schemas import Bond
+
+logger = logging.getLogger("Scenarios")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    Scenario parameters dataclass.
+
+    Args:
+        broker_fee (float): Broker fee as fraction of deal.
+        tax_rate (float): Income tax rate as fraction of income.
+        price_shift (float): Bond price shift in percents of current price.
+        date (datetime.date): Date to calculate yields from.
+    """
+
+    broker_fee: float
+    tax_rate: float
+    price_shift: float
+    date: datetime.date
+
+
+@dataclass
+class ScenarioGrid:
+    """
+    Grid of scenario parameters. Every combination of values is a scenario.
+
+    Args:
+        broker_fees (list[float]): Broker fees. Defaults to Bond.BROKER_FEE.
+        tax_rates (list[float]): Tax rates. Defaults to Bond.TAX_RATE.
+        price_shifts (list[float]): Price shifts in percents. Defaults to 0.
+        dates (list[datetime.date]): Dates to calculate yields from. Defaults to today.
+    """
+
+    broker_fees: list[float] = field(default_factory=lambda: [Bond.BROKER_FEE])
+    tax_rates: list[float] = field(default_factory=lambda: [Bond.TAX_RATE])
+    price_shifts: list[float] = field(default_factory=lambda: [0])
+    dates: list[datetime.date] = field(default_factory=lambda: [datetime.date.today()])
+
+    @property
+    def scenarios(self) -> list[Scenario]:
+        """
+        Returns all scenarios of the grid. Order matches rows of ScenarioResult.yields.
+
+        :return: List of scenarios.
+        :rtype: list[Scenario]
+        """
+        return [
+            Scenario(*params)
+            for params in itertools.product(
+                self.broker_fees, self.tax_rates, self.price_shifts, self.dates
+            )
+        ]
+
+
+@dataclass
+class ScenarioResult:
+    """
+    Scenarios evaluation result dataclass.
+
+    Args:
+        scenarios (list[Scenario]): Evaluated scenarios.
+        yields (np.ndarray): Annual yields after tax in percents. Shape: (scenarios, bonds).
+    """
+
+    scenarios: list[Scenario]
+    yields: np.ndarray
+
+    def top_indices(self, n: int) -> np.ndarray:
+        """
+        Returns indices of n best bonds for every scenario, best first.
+
+        :param n: Amount of bonds per scenario.
+        :type n: int
+        :return: Array of bond indices. Shape: (scenarios, n).
+        :rtype: np.ndarray
+        """
+        n = min(n, self.yields.shape[1])
+        if n <= 0:
+            return np.empty((len(self.scenarios), 0), dtype=np.intp)
+        top = np.argpartition(-self.yields, n - 1, axis=1)[:, :n]
+        top_yields = np.take_along_axis(self.yields, top, axis=1)
+        order = np.argsort(-top_yields, axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1)
+
+    def ranking(self, bonds: list[Bond], n: int) -> dict[Scenario, list[Bond]]:
+        """
+        Returns n best bonds for every scenario.
+
+        :param bonds: List of bonds passed to evaluate_scenarios.
+        :type bonds: list[Bond]
+        :param n: Amount of bonds per scenario.
+        :type n: int
+        :return: Dictionary {scenario: list of best bonds}.
+        :rtype: dict[Scenario, list[Bond]]
+        """
+        return {
+            scenario: [bonds[i] for i in row]
+            for scenario, row in zip(self.scenarios, self.top_indices(n))
+        }
+
+
+def evaluate_scenarios(bonds: list[Bond], grid: ScenarioGrid) -> ScenarioResult:
+    """
+    Calculates annual after-tax yields of all bonds in all scenarios of the grid.
+    Uses the same formulas as Bond properties without rounding.
+    Tax is applied to positive yields only.
+
+    :param bonds: List of bonds.
+    :type bonds: list[Bond]
+    :param grid: Grid of scenario parameters.
+    :type grid: ScenarioGrid
+    :return: Evaluation result.
+    :rtype: ScenarioResult
+    """
+    face_value = np.array([b.face_value for b in bonds], dtype=float)
+    coupon_value = np.array([b.coupon_value for b in bonds], dtype=float)
+    coupon_period = np.array([b.coupon_period for b in bonds], dtype=float)
+    price = np.array([b.bond_price for b in bonds], dtype=float)
+    ACI = np.array([b.ACI for b in bonds], dtype=float)
+    maturity = np.array([b.maturity_date.toordinal() for b in bonds], dtype=float)
+
+    fees = np.asarray(grid.broker_fees, dtype=float)[:, None, None]
+    taxes = np.asarray(grid.tax_rates, dtype=float)[None, :, None, None, None]
+    shifts = np.asarray(grid.price_shifts, dtype=float)[:, None]
+    dates = np.array([d.toordinal() for d in grid.dates], dtype=float)[:, None]
+
+    # (dates, bonds)
+    days = maturity - dates
+    full_coupons, part_coupon = np.divmod(days, coupon_period)
+    coupons = full_coupons + (part_coupon != 0)
+    total_income = face_value + coupons * coupon_value
+
+    # (shifts, bonds)
+    market_price = face_value * price * (1 + shifts / 100) / 100 + ACI
+
+    # (fees, 1, shifts, 1, bonds)
+    broker_price = (market_price * (1 + fees))[:, None, :, None, :]
+
+    # (fees, taxes, shifts, dates, bonds)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_yield = (total_income / broker_price - 1) * 100
+        # Tax is paid from income only, losses stay as is.
+        total_yield = np.where(total_yield > 0, total_yield * (1 - taxes), total_yield)
+        annual_yield = total_yield / days * 365
+    annual_yield = np.where(days > 0, annual_yield, 0)
+    annual_yield = np.nan_to_num(annual_yield, nan=0, posinf=0, neginf=0)
+
+    scenarios = grid.scenarios
+    yields = annual_yield.reshape(len(scenarios), len(bonds))
+    logger.info(
+        "Рассчитано %d сценариев для %d облигаций.", yields.shape[0], len(bonds)
+    )
+    return ScenarioResult(scenarios, yields)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Ranks bonds for every combination of scenario parameters."
+    )
+    parser.add_argument(
+        "--fees",
+        type=float,
+        nargs="+",
+        default=[Bond.BROKER_FEE * 100],
+        help="Broker fees in percents.",
+    )
+    parser.add_argument(
+        "--taxes",
+        type=float,
+        nargs="+",
+        default=[Bond.TAX_RATE * 100],
+        help="Tax rates in percents.",
+    )
+    parser.add_argument(
+        "--shifts",
+        type=float,
+        nargs="+",
+        default=[0],
+        help="Price shifts in percents.",
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        nargs="+",
+        default=[0],
+        help="Days from today to calculate yields from.",
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=datetime.date.fromisoformat,
+        help="Use bonds from SnapshotStore snapshot of date (YYYY-MM-DD) instead of MOEX.",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Bonds per scenario.")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        from storage import SnapshotStore
+
+        with SnapshotStore() as store:
+            bonds = store.load_bonds(args.snapshot)
+    else:
+        from moex import MOEX_API
+
+        bonds = MOEX_API().get_bonds()
+
+    today = datetime.date.today()
+    grid = ScenarioGrid(
+        broker_fees=[fee / 100 for fee in args.fees],
+        tax_rates=[tax / 100 for tax in args.taxes],
+        price_shifts=args.shifts,
+        dates=[today + datetime.timedelta(days=d) for d in args.days],
+    )
+    result = evaluate_scenarios(bonds, grid)
+    top = result.top_indices(args.top)
+    for scenario, row, indices in zip(result.scenarios, result.yields, top):
+        print(
+            f"Комиссия {scenario.broker_fee * 100:.3f}%, налог {scenario.tax_rate * 100:.1f}%, "
+            f"сдвиг цены {scenario.price_shift:+.1f}%, дата {scenario.date:%d.%m.%Y}:"
+        )
+        for i in indices:
+            print(f"    {bonds[i].ISIN:<14} {bonds[i].bond_name:<30} {row[i]:8.2f}%")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    main()
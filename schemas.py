@@ -12,12 +12,14 @@ class SearchCriteria:
         min_days_to_maturity (float): Minimum days to bond maturity.
         max_days_to_maturity (float): Maximum days to bond maturity.
         face_units (list[str]): Allowed face units for bond. Defaults to "SUR". Use None if you don't care about face units.
+        top_n (int): Amount of best bonds to process after filtering. Defaults to None - process all bonds.
     """
 
     min_bond_yield: float = 0
     min_days_to_maturity: float = 1
     max_days_to_maturity: float = float("inf")
     face_units: list[str] | None = ("SUR",)  # Use None if don't care about face unit
+    top_n: int | None = None
 
 
 class Bond:
@@ -26,6 +28,7 @@ class Bond:
     """
 
     BROKER_FEE = 0.25 / 100
+    TAX_RATE = 13 / 100
 
     def __init__(
         self,
@@ -39,6 +42,8 @@ class Bond:
         ACI: float,
         face_unit: str,
         credit_score: str | None = None,
+        lot_size: int = 1,
+        reg_number: str | None = None,
     ):
         """
         Initialize Bond.
@@ -63,6 +68,10 @@ class Bond:
         :type face_unit: str
         :param credit_score: Bond credit score.
         :type credit_score: str | None
+        :param lot_size: Amount of bonds in one lot. Defaults to 1.
+        :type lot_size: int
+        :param reg_number: Bond state registration number.
+        :type reg_number: str | None
         """
         self.ISIN: str = ISIN
         self.bond_name: str = name
@@ -74,6 +83,8 @@ class Bond:
         self.ACI: float = ACI
         self.face_unit: str = face_unit
         self.credit_score: str = credit_score
+        self.lot_size: int = lot_size or 1
+        self.reg_number: str | None = reg_number
 
     @classmethod
     def from_list(cls, data: list):
@@ -87,6 +98,8 @@ class Bond:
             price=float(data[6]),
             ACI=float(data[7]),
             face_unit=data[8],
+            lot_size=int(data[9]) if len(data) > 9 and data[9] else 1,
+            reg_number=data[10] if len(data) > 10 else None,
         )
 
     @classmethod
@@ -121,6 +134,25 @@ class Bond:
             self.face_unit,
         ]
 
+    @property
+    def issuer(self) -> str:
+        """
+        Returns issuer code from registration number.
+        Format of registration number: 4B02-01-00001-R-001P, where 00001 is issuer code.
+        OFZ registration numbers (26238RMFS) have the same issuer.
+
+        :return: Issuer code. ISIN if registration number is unknown.
+        :rtype: str
+        """
+        if not self.reg_number:
+            return self.ISIN
+        parts = self.reg_number.split("-")
+        if len(parts) >= 3:
+            return parts[2]
+        if self.reg_number.endswith("RMFS"):
+            return "RMFS"
+        return self.reg_number
+
     @property
     def broker_price(self) -> float:
         """
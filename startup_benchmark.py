@@ -0,0 +1,88 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules which must not be imported before the window is shown.
+HEAVY_MODULES = (
+    "worker",
+    "moex",
+    "excel",
+    "export",
+    "utils",
+    "storage",
+    "portfolio",
+    "requests",
+    "bs4",
+    "lxml",
+    "openpyxl",
+    "numpy",
+)
+
+CHILD_CODE = f"""
+import time
+start = time.perf_counter()
+import sys
+import main
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+window = main.MainWindow()
+window.show()
+app.processEvents()
+print(time.perf_counter() - start)
+print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def measure_startup() -> tuple[float, list[str]]:
+    """
+    Starts new interpreter, imports main and shows MainWindow.
+
+    :return: Seconds from import of main to painted window and heavy modules loaded by then.
+    :rtype: tuple[float, list[str]]
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    return float(output[-2]), [m for m in output[-1].split(",") if m]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measures time to show main window.")
+    parser.add_argument(
+        "--budget-ms", type=float, default=500, help="Allowed median startup time."
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Amount of measurements.")
+    args = parser.parse_args()
+
+    times = []
+    heavy = set()
+    for _ in range(args.runs):
+        seconds, modules = measure_startup()
+        times.append(seconds * 1000)
+        heavy.update(modules)
+
+    median = statistics.median(times)
+    print(f"Startup: median {median:.0f} ms, min {min(times):.0f} ms, max {max(times):.0f} ms.")
+    print(f"Budget: {args.budget_ms:.0f} ms.")
+
+    failed = False
+    if median > args.budget_ms:
+        print("Startup time is over budget.")
+        failed = True
+    if heavy:
+        print(f"Heavy modules imported before window is shown: {', '.join(sorted(heavy))}.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+import datetime
+import logging
+import sqlite3
+
+from schemas import Bond
+
+logger = logging.getLogger("Storage")
+
+
+class SnapshotStore:
+    """
+    SQLite storage of daily bond snapshots.
+
+    Every snapshot row is keyed by (date, SECID).
+    Saving bonds again on the same date replaces the whole snapshot of that date,
+    older snapshots are never touched.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            date TEXT NOT NULL,
+            secid TEXT NOT NULL,
+            name TEXT,
+            face_value REAL,
+            coupon_value REAL,
+            coupon_period REAL,
+            maturity_date TEXT,
+            price REAL,
+            aci REAL,
+            face_unit TEXT,
+            credit_score TEXT,
+            broker_price REAL,
+            approximate_yield REAL,
+            yield_to_maturity REAL,
+            lot_size INTEGER,
+            reg_number TEXT,
+            PRIMARY KEY (date, secid)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS snapshots_secid_date ON snapshots (secid, date);
+    """
+
+    def __init__(self, file_name: str = "snapshots.sqlite3"):
+        """
+        Initialize a SnapshotStore. Creates database file if needed.
+
+        :param file_name: Path to database file. Defaults to "snapshots.sqlite3".
+        :type file_name: str
+        """
+        self.file_name = file_name
+        self.connection = sqlite3.connect(file_name)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes database connection.
+        """
+        self.connection.close()
+
+    def save_bonds(
+        self,
+        bonds: list[Bond],
+        date: datetime.date | None = None,
+        credit_scores: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Saves snapshot of given bonds. Previous snapshot of the same date is removed.
+
+        :param bonds: List of bonds to save.
+        :type bonds: list[Bond]
+        :param date: Snapshot date. Defaults to today.
+        :type date: datetime.date | None
+        :param credit_scores: Dictionary {SECID: credit score} for bonds without credit_score. Defaults to None.
+        :type credit_scores: dict[str, str] | None
+        """
+        date = (date or datetime.date.today()).isoformat()
+        credit_scores = credit_scores or {}
+        rows = [
+            (
+                date,
+                bond.ISIN,
+                bond.bond_name,
+                bond.face_value,
+                bond.coupon_value,
+                bond.coupon_period,
+                bond.maturity_date.isoformat(),
+                bond.bond_price,
+                bond.ACI,
+                bond.face_unit,
+                bond.credit_score or credit_scores.get(bond.ISIN),
+                bond.broker_price,
+                bond.approximate_yield,
+                bond.yield_to_maturity,
+                bond.lot_size,
+                bond.reg_number,
+            )
+            for bond in bonds
+        ]
+        with self.connection:
+            self.connection.execute("DELETE FROM snapshots WHERE date = ?", (date,))
+            # OR REPLACE: the same SECID may be traded in several boardgroups.
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO snapshots VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.info("Сохранен снимок за %s: %d облигаций.", date, len(rows))
+
+    def dates(self) -> list[datetime.date]:
+        """
+        Returns dates of all saved snapshots.
+
+        :return: Sorted list of snapshot dates.
+        :rtype: list[datetime.date]
+        """
+        cursor = self.connection.execute(
+            "SELECT DISTINCT date FROM snapshots ORDER BY date"
+        )
+        return [datetime.date.fromisoformat(date) for (date,) in cursor]
+
+    def load_bonds(self, date: datetime.date) -> list[Bond]:
+        """
+        Loads bonds from snapshot of specified date.
+
+        :param date: Snapshot date.
+        :type date: datetime.date
+        :return: List of bonds saved on specified date.
+        :rtype: list[Bond]
+        """
+        cursor = self.connection.execute(
+            "SELECT secid, name, face_value, coupon_value, coupon_period, "
+            "maturity_date, price, aci, face_unit, credit_score, lot_size, reg_number "
+            "FROM snapshots WHERE date = ?",
+            (date.isoformat(),),
+        )
+        return [
+            Bond(
+                ISIN=row[0],
+                name=row[1],
+                face_value=row[2],
+                coupon_value=row[3],
+                coupon_period=row[4],
+                maturity_date=datetime.date.fromisoformat(row[5]),
+                price=row[6],
+                ACI=row[7],
+                face_unit=row[8],
+                credit_score=row[9],
+                lot_size=row[10],
+                reg_number=row[11],
+            )
+            for row in cursor
+        ]
+
+    def yield_history(
+        self,
+        secid: str,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[tuple[datetime.date, float]]:
+        """
+        Returns approximate yield history of bond.
+
+        :param secid: Bond SECID.
+        :type secid: str
+        :param start: First date of period. Defaults to first snapshot.
+        :type start: datetime.date | None
+        :param end: Last date of period. Defaults to last snapshot.
+        :type end: datetime.date | None
+        :return: List of (date, approximate yield) pairs sorted by date.
+        :rtype: list[tuple[datetime.date, float]]
+        """
+        return self._history("approximate_yield", secid, start, end)
+
+    def price_history(
+        self,
+        secid: str,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[tuple[datetime.date, float]]:
+        """
+        Returns broker price history of bond.
+
+        :param secid: Bond SECID.
+        :type secid: str
+        :param start: First date of period. Defaults to first snapshot.
+        :type start: datetime.date | None
+        :param end: Last date of period. Defaults to last snapshot.
+        :type end: datetime.date | None
+        :return: List of (date, broker price) pairs sorted by date.
+        :rtype: list[tuple[datetime.date, float]]
+        """
+        return self._history("broker_price", secid, start, end)
+
+    def rating_history(
+        self,
+        secid: str,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+    ) -> list[tuple[datetime.date, str | None]]:
+        """
+        Returns issuer credit score history of bond.
+
+        :param secid: Bond SECID.
+        :type secid: str
+        :param start: First date of period. Defaults to first snapshot.
+        :type start: datetime.date | None
+        :param end: Last date of period. Defaults to last snapshot.
+        :type end: datetime.date | None
+        :return: List of (date, credit score) pairs sorted by date.
+        :rtype: list[tuple[datetime.date, str | None]]
+        """
+        return self._history("credit_score", secid, start, end)
+
+    def compare(
+        self, old_date: datetime.date, new_date: datetime.date
+    ) -> list[tuple[str, float, float, float, float]]:
+        """
+        Compares bonds present in both snapshots.
+
+        :param old_date: Date of the first snapshot.
+        :type old_date: datetime.date
+        :param new_date: Date of the second snapshot.
+        :type new_date: datetime.date
+        :return: List of (SECID, old yield, new yield, old price, new price) sorted by yield change.
+        :rtype: list[tuple[str, float, float, float, float]]
+        """
+        cursor = self.connection.execute(
+            "SELECT o.secid, o.approximate_yield, n.approximate_yield, "
+            "o.broker_price, n.broker_price "
+            "FROM snapshots o JOIN snapshots n ON n.date = ? AND n.secid = o.secid "
+            "WHERE o.date = ? "
+            "ORDER BY n.approximate_yield - o.approximate_yield DESC",
+            (new_date.isoformat(), old_date.isoformat()),
+        )
+        return cursor.fetchall()
+
+    def _history(
+        self,
+        column: str,
+        secid: str,
+        start: datetime.date | None,
+        end: datetime.date | None,
+    ) -> list[tuple[datetime.date, object]]:
+        """
+        Returns history of specified column for bond. Uses (secid, date) index.
+
+        :param column: Column name.
+        :type column: str
+        :param secid: Bond SECID.
+        :type secid: str
+        :param start: First date of period.
+        :type start: datetime.date | None
+        :param end: Last date of period.
+        :type end: datetime.date | None
+        :return: List of (date, value) pairs sorted by date.
+        :rtype: list[tuple[datetime.date, object]]
+        """
+        start = (start or datetime.date.min).isoformat()
+        end = (end or datetime.date.max).isoformat()
+        cursor = self.connection.execute(
+            f"SELECT date, {column} FROM snapshots "
+            "WHERE secid = ? AND date BETWEEN ? AND ? ORDER BY date",
+            (secid, start, end),
+        )
+        return [(datetime.date.fromisoformat(date), value) for date, value in cursor]
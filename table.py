@@ -0,0 +1,227 @@
+import logging
+
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+)
+
+from schemas import Bond
+
+logger = logging.getLogger("Table")
+
+
+class BondTableModel(QAbstractTableModel):
+    """
+    Table model over list of bonds.
+
+    Row values are computed once when bonds are added,
+    so view rendering and sorting never touch Bond properties.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = Bond.headers()
+        self._rows: list[list] = []
+        self._search_keys: list[str] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if isinstance(value, float):
+                return f"{value:.2f}"
+            return str(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return section + 1
+
+    def sort_key(self, row: int, column: int):
+        """
+        Returns raw value used for row sorting.
+
+        :param row: Row number.
+        :type row: int
+        :param column: Column number.
+        :type column: int
+        :return: Raw value of the cell.
+        """
+        return self._rows[row][column]
+
+    def search_key(self, row: int) -> str:
+        """
+        Returns precomputed lowercase text used for row filtering.
+
+        :param row: Row number.
+        :type row: int
+        :return: Lowercase text of row textual columns.
+        :rtype: str
+        """
+        return self._search_keys[row]
+
+    def add_bonds(self, bonds: list[Bond]) -> None:
+        """
+        Appends bonds to the end of the table.
+
+        :param bonds: List of bonds to add.
+        :type bonds: list[Bond]
+        """
+        if not bonds:
+            return
+
+        rows = [bond.as_list for bond in bonds]
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self._search_keys.extend(
+            " ".join(str(v) for v in row if isinstance(v, str)).lower()
+            for row in rows
+        )
+        self.endInsertRows()
+        logger.debug("В таблицу добавлено %d облигаций.", len(rows))
+
+    def clear(self) -> None:
+        """
+        Removes all bonds from the table.
+        """
+        self.beginResetModel()
+        self._rows.clear()
+        self._search_keys.clear()
+        self.endResetModel()
+
+
+class PortfolioTableModel(QAbstractTableModel):
+    """
+    Table model over list of portfolio positions.
+    """
+
+    HEADERS = [
+        "Наименование",
+        "Кредитный рейтинг эмитента",
+        "ISIN",
+        "Лотов, шт.",
+        "Облигаций в лоте, шт.",
+        "Стоимость, вал.",
+        "Годовой доход, вал.",
+        "Годовая доходность, %",
+        "Дней до погашения, дни",
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: list[list] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if isinstance(value, float):
+                return f"{value:.2f}"
+            return str(value)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.ItemDataRole.DisplayRole,
+    ):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return section + 1
+
+    def set_positions(self, positions: list) -> None:
+        """
+        Replaces table content with given positions.
+
+        :param positions: List of portfolio.Position.
+        :type positions: list
+        """
+        self.beginResetModel()
+        self._rows = [
+            [
+                p.bond.bond_name,
+                p.bond.credit_score or "Неизвестно",
+                p.bond.ISIN,
+                p.lots,
+                p.bond.lot_size,
+                p.cost,
+                p.annual_income,
+                p.bond.approximate_yield,
+                p.bond.days_to_maturity,
+            ]
+            for p in positions
+        ]
+        self.endResetModel()
+
+
+class BondFilterProxyModel(QSortFilterProxyModel):
+    """
+    Sort and filter proxy for BondTableModel.
+
+    Sorts by raw column values and filters rows by substring
+    of precomputed search keys.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pattern = ""
+        self.setDynamicSortFilter(True)
+
+    def set_pattern(self, pattern: str) -> None:
+        """
+        Sets substring to filter rows by.
+
+        :param pattern: Substring to search in bond name, ISIN, credit score and face unit.
+        :type pattern: str
+        """
+        self._pattern = pattern.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if not self._pattern:
+            return True
+        return self._pattern in self.sourceModel().search_key(source_row)
+
+    def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        # Raw values straight from the source model, without QVariant round-trip.
+        model = self.sourceModel()
+        left_value = model.sort_key(left.row(), left.column())
+        right_value = model.sort_key(right.row(), right.column())
+        try:
+            return left_value < right_value
+        except TypeError:
+            return str(left_value) < str(right_value)
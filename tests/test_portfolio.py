@@ -0,0 +1,134 @@
+import datetime
+import itertools
+import random
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from portfolio import LadderBucket, PortfolioConstraints, _solve_bucket, build_portfolio
+from schemas import Bond
+
+
+def make_bonds(count: int, issuers: int, seed: int = 0) -> list[Bond]:
+    rnd = random.Random(seed)
+    today = datetime.date.today()
+    return [
+        Bond(
+            ISIN=f"RU{i:04d}",
+            name=f"Bond {i}",
+            face_value=1000,
+            coupon_value=rnd.randint(20, 60),
+            coupon_period=182,
+            maturity_date=today + datetime.timedelta(days=rnd.randint(100, 2000)),
+            price=rnd.uniform(92, 96),
+            ACI=rnd.uniform(0, 10),
+            face_unit="SUR",
+            credit_score=rnd.choice(["ruAAA", "AA(RU)", "A+|ru|", "BB"]),
+            reg_number=f"4B02-01-{i % issuers:05d}-R",
+        )
+        for i in range(count)
+    ]
+
+
+def spent_by_issuer(positions) -> dict[str, float]:
+    spent = defaultdict(float)
+    for position in positions:
+        spent[position.bond.issuer] += position.cost
+    return spent
+
+
+@pytest.mark.parametrize("budget", [1e4, 1e6, 1e7])
+def test_budget_is_spent(budget):
+    bonds = make_bonds(100, 40)
+    positions = build_portfolio(bonds, PortfolioConstraints(budget=budget))
+    spent = sum(p.cost for p in positions)
+    max_lot_cost = max(b.lot_size * b.broker_price for b in bonds)
+
+    assert spent <= budget
+    assert spent > budget - max_lot_cost
+
+
+def test_issuer_cap_and_ladder():
+    bonds = make_bonds(300, 50, seed=1)
+    ladder = [LadderBucket(0, 365, 0.3), LadderBucket(366, float("inf"), 0.7)]
+    constraints = PortfolioConstraints(budget=1e6, ladder=ladder, issuer_cap=0.05)
+    positions = build_portfolio(bonds, constraints)
+
+    assert max(spent_by_issuer(positions).values()) <= 0.05 * 1e6 + 1e-6
+    for bucket in ladder:
+        spent = sum(
+            p.cost
+            for p in positions
+            if bucket.min_days_to_maturity
+            <= p.bond.days_to_maturity
+            <= bucket.max_days_to_maturity
+        )
+        assert spent <= bucket.share * 1e6 + 1e-6
+
+
+def test_min_rating():
+    bonds = make_bonds(100, 40, seed=2)
+    positions = build_portfolio(
+        bonds, PortfolioConstraints(budget=1e5, min_rating="AA")
+    )
+
+    assert positions
+    assert {p.bond.credit_score for p in positions} <= {"ruAAA", "AA(RU)"}
+
+
+def brute_force(groups, caps, costs, values, budget_units) -> float:
+    items = [i for indices in groups.values() for i in indices]
+    best = 0.0
+    for counts in itertools.product(
+        *(range(budget_units // costs[i] + 1) for i in items)
+    ):
+        amounts = dict(zip(items, counts))
+        if sum(costs[i] * n for i, n in amounts.items()) > budget_units:
+            continue
+        if any(
+            sum(costs[i] * amounts[i] for i in indices) > caps[issuer]
+            for issuer, indices in groups.items()
+        ):
+            continue
+        best = max(best, sum(values[i] * n for i, n in amounts.items()))
+    return best
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_solve_bucket_matches_brute_force(seed):
+    rnd = random.Random(seed)
+    count = rnd.randint(1, 4)
+    costs = np.array([rnd.randint(1, 5) for _ in range(count)])
+    values = np.array([rnd.uniform(0, 10) for _ in range(count)])
+    groups = defaultdict(list)
+    for i in range(count):
+        groups[f"issuer {rnd.randint(0, 1)}"].append(i)
+    budget_units = rnd.randint(1, 10)
+    caps = {issuer: rnd.randint(0, budget_units) for issuer in groups}
+
+    result = _solve_bucket(dict(groups), caps, costs, values, budget_units)
+
+    assert sum(costs[i] * n for i, n in result.items()) <= budget_units
+    for issuer, indices in groups.items():
+        assert sum(costs[i] * result.get(i, 0) for i in indices) <= caps[issuer]
+    assert sum(values[i] * n for i, n in result.items()) == pytest.approx(
+        brute_force(groups, caps, costs, values, budget_units)
+    )
+
+
+def test_other_currencies_are_skipped():
+    bonds = make_bonds(20, 10, seed=3)
+    for bond in bonds[:10]:
+        bond.face_unit = "USD"
+        bond.coupon_value *= 3  # more profitable, but not in budget currency
+    positions = build_portfolio(bonds, PortfolioConstraints(budget=1e5))
+
+    assert positions
+    assert {p.bond.face_unit for p in positions} == {"SUR"}
+    assert sum(p.cost for p in positions) <= 1e5
+
+    positions = build_portfolio(
+        bonds, PortfolioConstraints(budget=1e5, face_unit="USD")
+    )
+    assert {p.bond.face_unit for p in positions} == {"USD"}
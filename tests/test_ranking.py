@@ -0,0 +1,81 @@
+import datetime
+import random
+
+import pytest
+
+import ranking
+from ranking import UNKNOWN_RATING_BUCKET, rank_bonds, rating_bucket
+from schemas import Bond
+
+
+@pytest.mark.parametrize(
+    "credit_score, bucket",
+    [
+        ("ruAAA", 0),
+        ("ruAA-", 1),
+        ("AA(RU)", 1),
+        ("AA+|ru|", 1),
+        ("A+|ru|", 2),
+        ("ruBBB+", 3),
+        ("ruCCC", 6),
+        ("D", 7),
+        ("Неизвестно", UNKNOWN_RATING_BUCKET),
+        ("", UNKNOWN_RATING_BUCKET),
+        (None, UNKNOWN_RATING_BUCKET),
+    ],
+)
+def test_rating_bucket(credit_score, bucket):
+    assert rating_bucket(credit_score) == bucket
+
+
+def make_bonds(count: int, seed: int = 0) -> list[Bond]:
+    # Few distinct values, so many bonds have equal keys.
+    rnd = random.Random(seed)
+    today = datetime.date.today()
+    return [
+        Bond(
+            ISIN=f"RU{i:04d}",
+            name=f"Bond {i}",
+            face_value=1000,
+            coupon_value=rnd.choice([30, 40]),
+            coupon_period=182,
+            maturity_date=today + datetime.timedelta(days=rnd.choice([400, 800])),
+            price=rnd.choice([95, 100]),
+            ACI=0,
+            face_unit="SUR",
+            credit_score=rnd.choice(["ruAA", "AA(RU)", "ruA-", None]),
+        )
+        for i in range(count)
+    ]
+
+
+def full_sort(bonds: list[Bond], keys) -> list[Bond]:
+    def key(bond):
+        return tuple(
+            -ranking.KEY_GETTERS[name](bond)
+            if descending
+            else ranking.KEY_GETTERS[name](bond)
+            for name, descending in keys
+        )
+
+    return sorted(bonds, key=key)
+
+
+@pytest.mark.parametrize("keys", [ranking.DEFAULT_KEYS, ranking.PRESCORE_KEYS])
+@pytest.mark.parametrize("n", [None, 0, 1, 7, 50, 200])
+def test_rank_bonds_matches_full_sort(keys, n):
+    bonds = make_bonds(100)
+    expected = full_sort(bonds, keys)
+    if n is not None:
+        expected = expected[:n]
+
+    assert [b.ISIN for b in rank_bonds(bonds, n, keys)] == [b.ISIN for b in expected]
+
+
+def test_rank_bonds_keeps_input_order_of_ties():
+    bonds = make_bonds(10)
+    for bond in bonds:
+        bond.coupon_value, bond.bond_price, bond.credit_score = 40, 100, "ruAA"
+        bond.maturity_date = datetime.date.today() + datetime.timedelta(days=500)
+
+    assert rank_bonds(bonds, 5) == bonds[:5]
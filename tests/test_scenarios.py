@@ -0,0 +1,79 @@
+import datetime
+import random
+
+import numpy as np
+import pytest
+
+from scenarios import ScenarioGrid, evaluate_scenarios
+from schemas import Bond
+
+
+def make_bonds(count: int, seed: int = 0) -> list[Bond]:
+    rnd = random.Random(seed)
+    today = datetime.date.today()
+    return [
+        Bond(
+            ISIN=f"RU{i:04d}",
+            name=f"Bond {i}",
+            face_value=1000,
+            coupon_value=rnd.randint(10, 60),
+            coupon_period=rnd.choice([91, 182]),
+            maturity_date=today + datetime.timedelta(days=rnd.randint(200, 2000)),
+            price=rnd.uniform(85, 110),
+            ACI=rnd.uniform(0, 20),
+            face_unit="SUR",
+        )
+        for i in range(count)
+    ]
+
+
+def test_matches_bond_approximate_yield():
+    bonds = make_bonds(50)
+    result = evaluate_scenarios(bonds, ScenarioGrid(tax_rates=[0]))
+
+    assert result.yields.shape == (1, len(bonds))
+    # Bond rounds yield to maturity to 2 digits before annualizing.
+    assert result.yields[0] == pytest.approx(
+        [bond.approximate_yield for bond in bonds], abs=0.02
+    )
+
+
+def test_rows_follow_grid_scenarios():
+    bonds = make_bonds(20, seed=1)
+    today = datetime.date.today()
+    grid = ScenarioGrid(
+        broker_fees=[0, 0.01],
+        tax_rates=[0, 0.13, 0.3],
+        price_shifts=[-5, 0, 5, 10],
+        dates=[today, today + datetime.timedelta(days=30)],
+    )
+    result = evaluate_scenarios(bonds, grid)
+
+    assert result.scenarios == grid.scenarios
+    assert result.yields.shape == (2 * 3 * 4 * 2, len(bonds))
+    for scenario, row in zip(result.scenarios, result.yields):
+        single = ScenarioGrid(
+            broker_fees=[scenario.broker_fee],
+            tax_rates=[scenario.tax_rate],
+            price_shifts=[scenario.price_shift],
+            dates=[scenario.date],
+        )
+        np.testing.assert_allclose(row, evaluate_scenarios(bonds, single).yields[0])
+
+
+def test_tax_only_on_gains():
+    bond = make_bonds(1)[0]
+    bond.bond_price = 200  # bought far above face value: negative yield
+    result = evaluate_scenarios([bond], ScenarioGrid(tax_rates=[0, 0.13]))
+
+    assert result.yields[0, 0] < 0
+    assert result.yields[1, 0] == pytest.approx(result.yields[0, 0])
+
+
+def test_empty_universe():
+    grid = ScenarioGrid(tax_rates=[0, 0.13], price_shifts=[0, 5])
+    result = evaluate_scenarios([], grid)
+
+    assert result.yields.shape == (4, 0)
+    assert result.top_indices(10).shape == (4, 0)
+    assert all(bonds == [] for bonds in result.ranking([], 10).values())
@@ -0,0 +1,83 @@
+import datetime
+
+import pytest
+
+from schemas import Bond
+from storage import SnapshotStore
+
+
+def make_bond(isin: str, price: float, credit_score: str | None = None) -> Bond:
+    return Bond(
+        ISIN=isin,
+        name=f"Bond {isin}",
+        face_value=1000,
+        coupon_value=40,
+        coupon_period=182,
+        maturity_date=datetime.date.today() + datetime.timedelta(days=700),
+        price=price,
+        ACI=5,
+        face_unit="SUR",
+        credit_score=credit_score,
+        lot_size=10,
+        reg_number=f"4B02-01-{isin}-R",
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SnapshotStore(str(tmp_path / "snapshots.sqlite3")) as store:
+        yield store
+
+
+def test_save_load_round_trip(store):
+    date = datetime.date(2026, 1, 10)
+    bonds = [make_bond("RU0001", 95, "ruAA"), make_bond("RU0002", 101)]
+    store.save_bonds(bonds, date, credit_scores={"RU0002": "A+|ru|"})
+
+    loaded = {bond.ISIN: bond for bond in store.load_bonds(date)}
+
+    assert store.dates() == [date]
+    assert loaded.keys() == {"RU0001", "RU0002"}
+    for bond in bonds:
+        assert loaded[bond.ISIN].as_list[2:] == bond.as_list[2:]
+        assert loaded[bond.ISIN].lot_size == bond.lot_size
+        assert loaded[bond.ISIN].reg_number == bond.reg_number
+    assert loaded["RU0001"].credit_score == "ruAA"
+    assert loaded["RU0002"].credit_score == "A+|ru|"
+
+
+def test_save_same_date_replaces_snapshot(store):
+    date = datetime.date(2026, 1, 10)
+    store.save_bonds([make_bond(f"RU000{i}", 95) for i in range(3)], date)
+    store.save_bonds([make_bond("RU0009", 97)], date)
+
+    assert [bond.ISIN for bond in store.load_bonds(date)] == ["RU0009"]
+
+
+def test_history_and_compare(store):
+    old_date = datetime.date(2026, 1, 10)
+    new_date = datetime.date(2026, 1, 11)
+    store.save_bonds(
+        [make_bond("RU0001", 95, "ruA"), make_bond("RU0002", 95)], old_date
+    )
+    store.save_bonds(
+        [make_bond("RU0001", 90, "ruAA"), make_bond("RU0003", 95)], new_date
+    )
+    old_bond, new_bond = make_bond("RU0001", 95), make_bond("RU0001", 90)
+
+    assert store.rating_history("RU0001") == [(old_date, "ruA"), (new_date, "ruAA")]
+    assert store.price_history("RU0001", start=new_date) == [
+        (new_date, pytest.approx(new_bond.broker_price))
+    ]
+    assert store.yield_history("RU0001", end=old_date) == [
+        (old_date, pytest.approx(old_bond.approximate_yield))
+    ]
+    assert store.compare(old_date, new_date) == [
+        (
+            "RU0001",
+            pytest.approx(old_bond.approximate_yield),
+            pytest.approx(new_bond.approximate_yield),
+            pytest.approx(old_bond.broker_price),
+            pytest.approx(new_bond.broker_price),
+        )
+    ]
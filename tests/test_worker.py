@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+import worker
+from portfolio import LadderBucket, PortfolioConstraints
+from schemas import Bond, SearchCriteria
+
+
+def make_bonds(count: int) -> list[Bond]:
+    today = datetime.date.today()
+    return [
+        Bond(
+            ISIN=f"RU{i:04d}",
+            name=f"Bond {i}",
+            face_value=1000,
+            coupon_value=40,
+            coupon_period=182,
+            maturity_date=today + datetime.timedelta(days=30 + i),
+            price=97,
+            ACI=0,
+            face_unit="SUR",
+            reg_number=f"4B02-01-{i % 100:05d}-R",
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def run_worker(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # snapshots database
+    monkeypatch.setattr(worker.MOEX_API, "get_bonds", lambda self: make_bonds(3000))
+
+    def with_credit_scores(bonds):
+        for bond in bonds:
+            bond.credit_score = "ruAA"
+        return bonds
+
+    monkeypatch.setattr(worker.utils, "with_credit_scores", with_credit_scores)
+
+    def run(constraints: PortfolioConstraints) -> dict[str, list]:
+        emitted = {"portfolio": [], "finished": [], "error": []}
+        w = worker.Worker(
+            SearchCriteria(top_n=300),
+            export_excel=False,
+            portfolio_constraints=constraints,
+        )
+        for name, values in emitted.items():
+            getattr(w.signals, name).connect(values.append)
+        w.run()
+        return emitted
+
+    return run
+
+
+def test_short_ladder_gets_positions(run_worker):
+    ladder = [LadderBucket(0, 364, 0.5), LadderBucket(365, 729, 0.5)]
+    emitted = run_worker(PortfolioConstraints(budget=1e6, ladder=ladder))
+
+    assert emitted["error"] == []
+    assert emitted["finished"] == [""]
+    (positions,) = emitted["portfolio"]
+    for bucket in ladder:
+        spent = sum(
+            p.cost
+            for p in positions
+            if bucket.min_days_to_maturity
+            <= p.bond.days_to_maturity
+            <= bucket.max_days_to_maturity
+        )
+        assert 0.9 * bucket.share * 1e6 < spent <= bucket.share * 1e6
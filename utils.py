@@ -1,5 +1,6 @@
 import logging
 import copy
+from collections import Counter
 import requests
 from bs4 import BeautifulSoup
 
@@ -7,6 +8,8 @@ from schemas import Bond, SearchCriteria
 
 logger = logging.getLogger("Utils")
 
+UNKNOWN_CREDIT_SCORE = "Неизвестно"
+
 
 def filter_bonds(bonds: list[Bond], criteria: SearchCriteria) -> list[Bond]:
     """
@@ -20,22 +23,37 @@ def filter_bonds(bonds: list[Bond], criteria: SearchCriteria) -> list[Bond]:
     :rtype: list[Bond]
     """
     filtered_bonds = []
+    rejected = Counter()
+    debug = logger.isEnabledFor(logging.DEBUG)
     for bond in bonds:
-        if not (criteria.min_days_to_maturity <= bond.days_to_maturity):
-            logger.info(f"Облигация {bond.ISIN} не прошла проверку по сроку погашения.")
-            continue
-        if not (bond.days_to_maturity <= criteria.max_days_to_maturity):
-            logger.info(f"Облигация {bond.ISIN} не прошла проверку по сроку погашения.")
-            continue
-        if not (criteria.min_bond_yield <= bond.approximate_yield):
-            logger.info(f"Облигация {bond.ISIN} не прошла проверку по доходности.")
-            continue
-        if not (criteria.face_units is None or bond.face_unit in criteria.face_units):
-            logger.info(f"Облигация {bond.ISIN} не прошла проверку по валюте.")
+        days_to_maturity = bond.days_to_maturity
+        if not (criteria.min_days_to_maturity <= days_to_maturity):
+            reason = "сроку погашения"
+        elif not (days_to_maturity <= criteria.max_days_to_maturity):
+            reason = "сроку погашения"
+        elif not (criteria.min_bond_yield <= bond.approximate_yield):
+            reason = "доходности"
+        elif not (
+            criteria.face_units is None or bond.face_unit in criteria.face_units
+        ):
+            reason = "валюте"
+        else:
+            if debug:
+                logger.debug("Облигация %s прошла проверку критериев.", bond.ISIN)
+            filtered_bonds.append(bond)
             continue
 
-        logger.info(f"Облигация {bond.ISIN} прошла проверку критериев.")
-        filtered_bonds.append(bond)
+        rejected[reason] += 1
+        if debug:
+            logger.debug("Облигация %s не прошла проверку по %s.", bond.ISIN, reason)
+
+    for reason, count in rejected.items():
+        logger.info("Не прошли проверку по %s: %d облигаций.", reason, count)
+    logger.info(
+        "Прошли проверку критериев %d из %d облигаций.",
+        len(filtered_bonds),
+        len(bonds),
+    )
     return filtered_bonds
 
 
@@ -49,8 +67,16 @@ def with_credit_scores(bonds: list[Bond]) -> list[Bond]:
     :rtype: list[Bond]
     """
     new_bonds = copy.deepcopy(bonds)
+    unknown = 0
     for bond in new_bonds:
         bond.credit_score = _get_credit_score_SMARTLAB(bond.ISIN)
+        unknown += bond.credit_score == UNKNOWN_CREDIT_SCORE
+    if unknown:
+        logger.info(
+            "Кредитный рейтинг не известен для %d из %d облигаций.",
+            unknown,
+            len(new_bonds),
+        )
     return new_bonds
 
 
@@ -63,18 +89,17 @@ def _get_credit_score_SMARTLAB(ISIN: str) -> str:
     :return: Credit score as string. Returns 'Неизвестно' if not found.
     :rtype: str
     """
-    logger.info(f"Получение кредитного рейтинга эмитента облигации {ISIN}.")
+    logger.debug("Получение кредитного рейтинга эмитента облигации %s.", ISIN)
     BASE_URL = "https://smart-lab.ru/q/bonds/{}"
     response = requests.get(BASE_URL.format(ISIN))
     soup = BeautifulSoup(response.text, "lxml")
-    score = "Неизвестно"  # Default value
+    score = UNKNOWN_CREDIT_SCORE  # Default value
     try:
         div = soup.find("div", text="Кредитный рейтинг")
         score = div.find_next().text.strip()
-        logger.info(f"Кредитный рейтинг эмитента облигации {ISIN} - {score}.")
-    except AttributeError as e:
-        logger.info(f"Кредитный рейтинг эмитента облигации {ISIN} не известен.")
-        logger.exception(e)
+        logger.debug("Кредитный рейтинг эмитента облигации %s - %s.", ISIN, score)
+    except AttributeError:
+        logger.debug("Кредитный рейтинг эмитента облигации %s не известен.", ISIN)
     except Exception as e:
         logger.exception(e)
     return score
@@ -1,10 +1,16 @@
+from concurrent.futures import Future
 import logging
+import sqlite3
+import threading
 
 from PySide6.QtCore import QObject, Signal, QRunnable, Slot
 
 from moex import MOEX_API
-from excel import ExcelBook
+from portfolio import PortfolioConstraints, build_portfolio, select_candidates
 from schemas import SearchCriteria
+from storage import SnapshotStore
+import export
+import ranking
 import utils
 
 
@@ -19,16 +25,22 @@ class WorkerSignals(QObject):
     Supported signals are:
 
     finished
-        Name of the created file.
+        Name of the created file. Empty string if export is disabled.
     error
         str
     progress
         Percent of work completed.
+    result
+        Batch of processed bonds.
+    portfolio
+        List of portfolio positions.
     """
 
     finished = Signal(str)
     progress = Signal(int)
     error = Signal(str)
+    result = Signal(list)
+    portfolio = Signal(list)
 
 
 class Worker(QRunnable):
@@ -37,18 +49,35 @@ class Worker(QRunnable):
     """
 
     TOTAL_STEPS = 5
-
-    def __init__(self, search_criteria: SearchCriteria, parent=None):
+    RESULT_BATCH_SIZE = 50
+
+    def __init__(
+        self,
+        search_criteria: SearchCriteria,
+        export_excel: bool = True,
+        split_by_currency: bool = False,
+        portfolio_constraints: PortfolioConstraints | None = None,
+        parent=None,
+    ):
         """
         Initialize the Worker.
 
         :param search_criteria: Search criterias for bonds filtering.
         :type search_criteria: SearchCriteria
+        :param export_excel: Save bonds to excel file. Defaults to True.
+        :type export_excel: bool
+        :param split_by_currency: Also save separate file for every currency. Defaults to False.
+        :type split_by_currency: bool
+        :param portfolio_constraints: Constraints to build portfolio. Defaults to None - don't build portfolio.
+        :type portfolio_constraints: PortfolioConstraints | None
         :param parent: QT parent.
         """
         super().__init__(parent)
         self._step = 0
         self.search_criteria = search_criteria
+        self.export_excel = export_excel
+        self.split_by_currency = split_by_currency
+        self.portfolio_constraints = portfolio_constraints
         self.moex_api = MOEX_API()
         self.signals = WorkerSignals()
         self.signals.progress.emit(0)
@@ -78,27 +107,101 @@ class Worker(QRunnable):
         Does worker steps:
             - Receive bonds.
             - Filter bonds.
-            - Parse credit scores.
-            - Sort bond by approximate yield.
-            - Init ExcelBook. Save bonds to excel.
+            - Select top bonds by yield and maturity.
+            - Parse credit scores. Emit bonds by batches.
+            - Rank bonds by yield, rating and maturity.
+            - Build portfolio from top bonds and top bonds of every ladder bucket (if constraints are given).
+            - Save snapshot of all received bonds to SnapshotStore.
+            - Start saving bonds to excel in export processes (if enabled).
         """
         logger.info(f"Начало работы")
 
-        bonds = self.moex_api.get_bonds()
+        all_bonds = self.moex_api.get_bonds()
         self.emit_step()
 
-        bonds = utils.filter_bonds(bonds, self.search_criteria)
+        filtered_bonds = utils.filter_bonds(all_bonds, self.search_criteria)
         self.emit_step()
 
-        bonds = utils.with_credit_scores(bonds)
+        bonds = ranking.rank_bonds(
+            filtered_bonds, self.search_criteria.top_n, ranking.PRESCORE_KEYS
+        )
         self.emit_step()
 
-        bonds.sort(key=lambda b: -b.yield_to_maturity)
+        scored_bonds = []
+        for i in range(0, len(bonds), self.RESULT_BATCH_SIZE):
+            batch = utils.with_credit_scores(bonds[i:i + self.RESULT_BATCH_SIZE])
+            scored_bonds.extend(batch)
+            self.signals.result.emit(batch)
+        scored_bonds = ranking.rank_bonds(scored_bonds)
+
+        portfolio_bonds = []
+        if self.portfolio_constraints is not None:
+            # Top bonds may have no bonds for short ladder buckets.
+            scored = {bond.ISIN for bond in scored_bonds}
+            candidates = select_candidates(
+                filtered_bonds, self.portfolio_constraints, self.search_criteria.top_n
+            )
+            portfolio_bonds = utils.with_credit_scores(
+                [bond for bond in candidates if bond.ISIN not in scored]
+            )
+            positions = build_portfolio(
+                scored_bonds + portfolio_bonds, self.portfolio_constraints
+            )
+            self.signals.portfolio.emit(positions)
+
+        # Snapshot of the whole market, credit scores are known only for scored bonds.
+        # History is optional, so failed write doesn't stop export.
+        try:
+            with SnapshotStore() as store:
+                store.save_bonds(
+                    all_bonds,
+                    credit_scores={
+                        bond.ISIN: bond.credit_score
+                        for bond in scored_bonds + portfolio_bonds
+                    },
+                )
+        except sqlite3.Error as e:
+            logger.warning("Не удалось сохранить снимок: %s", e)
         self.emit_step()
 
-        book = ExcelBook()
-        book.write_bonds(bonds)
-        self.emit_step()
+        if not self.export_excel:
+            self.emit_step()
+            logger.info(f"Конец работы")
+            self.signals.finished.emit("")
+            return
+
+        group_by = (lambda bond: bond.face_unit) if self.split_by_currency else None
+        futures = export.export_bonds(scored_bonds, group_by)
+        self._report_export(futures)
 
-        logger.info(f"Конец работы")
-        self.signals.finished.emit(book.file_name)
+    def _report_export(self, futures: list[Future]) -> None:
+        """
+        Emits finished with name of the file with all bonds when all export futures are done.
+        Emits error for every failed export instead of finished.
+
+        :param futures: Futures from export.export_bonds.
+        :type futures: list[Future]
+        """
+        signals = self.signals
+        pending = set(futures)
+        lock = threading.Lock()
+
+        def on_done(future: Future) -> None:
+            with lock:
+                pending.discard(future)
+                if pending:
+                    return
+
+            errors = [e for e in (f.exception() for f in futures) if e is not None]
+            for e in errors:
+                logger.error("Ошибка экспорта.", exc_info=e)
+                signals.error.emit(str(e))
+            if errors:
+                return
+
+            signals.progress.emit(100)
+            logger.info(f"Конец работы")
+            signals.finished.emit(futures[0].result())
+
+        for future in futures:
+            future.add_done_callback(on_done)